@@ -1,9 +1,9 @@
 import argparse
 import asyncio
-import json
 import os
 from pathlib import Path
 
+import orjson
 import pandas as pd
 from dotenv import load_dotenv
 from monzo.authentication import Authentication
@@ -13,8 +13,7 @@ from monzo_api_wrapper.utils.db import Db
 
 from monzo_lunch_money.custom.apply_transformations import (
     apply_transformations,
-    get_main_transsactions_df,
-    get_pot_transsactions_df,
+    concat_transactions_dfs,
 )
 from monzo_lunch_money.custom.get_changed_lunch_money_transactions_dct import (
     get_changed_lunch_money_transactions_dct,
@@ -40,6 +39,44 @@ pd.set_option("mode.chained_assignment", None)
 logger = CustomLogger.get_logger()
 
 
+@loggable
+async def fetch_all_transactions(
+    monzo_auth_obj: Authentication,
+    days_lookback: int,
+    main_accounts: dict,
+    pot_accounts: dict | None,
+    include_pots: bool = True,
+) -> tuple[dict, dict]:
+    """Fetch main account and pot transactions from Monzo concurrently.
+
+    Args:
+        monzo_auth_obj (Authentication): Authentication object
+        days_lookback (int): Number of days to lookback in fetching results
+        main_accounts (dict): Dictionary of main account details
+        pot_accounts (dict): Dictionary of pot account details
+        include_pots (bool): Flag to include Pots in transactions processing
+
+    Returns:
+        tuple: Main account and pot transactions dictionaries, pots empty if not included.
+
+    """
+    main_transactions = get_main_transactions(
+        monzo_auth_obj=monzo_auth_obj, days_lookback=days_lookback, main_accounts=main_accounts
+    )
+    if not include_pots:
+        return await main_transactions, {}
+
+    transactions_dct, pot_transactions_dct = await asyncio.gather(
+        main_transactions,
+        get_pot_transactions(
+            monzo_auth_obj=monzo_auth_obj,
+            days_lookback=days_lookback,
+            pot_accounts=pot_accounts,
+        ),
+    )
+    return transactions_dct, pot_transactions_dct
+
+
 @loggable
 def get_transactions(
     monzo_auth_obj: Authentication,
@@ -61,29 +98,22 @@ def get_transactions(
         pd.DataFrame: Dataframe of transactions fetched.
 
     """
-    transactions_dct = asyncio.run(
-        get_main_transactions(
-            monzo_auth_obj=monzo_auth_obj, days_lookback=days_lookback, main_accounts=main_accounts
+    transactions_dct, pot_transactions_dct = asyncio.run(
+        fetch_all_transactions(
+            monzo_auth_obj=monzo_auth_obj,
+            days_lookback=days_lookback,
+            main_accounts=main_accounts,
+            pot_accounts=pot_accounts,
+            include_pots=include_pots,
         )
     )
 
-    transactions_df = get_main_transsactions_df(transactions_dct)
-
     if include_pots:
-        pot_transactions_dct = asyncio.run(
-            get_pot_transactions(
-                monzo_auth_obj=monzo_auth_obj,
-                days_lookback=days_lookback,
-                pot_accounts=pot_accounts,
-            )
-        )
-        pot_transactions_df = get_pot_transsactions_df(pot_transactions_dct)
-
         logger.debug(
             "Combining main account and pot transactions into one dataframe for processing"
         )
-        return pd.concat([transactions_df, pot_transactions_df], ignore_index=True)
-    return transactions_df
+        return concat_transactions_dfs(transactions_dct, pot_transactions_dct)
+    return concat_transactions_dfs(transactions_dct)
 
 
 @loggable
@@ -95,8 +125,7 @@ def get_source_accounts() -> tuple[dict, dict]:
 
     """
     path = Path(os.getenv("MONZO_SOURCE_ACCOUNTS_PATH"))
-    with path.open("r") as f:
-        source_accounts = json.loads(f.read())
+    source_accounts = orjson.loads(path.read_bytes())
 
     main_accounts = source_accounts["MAIN_ACCOUNTS"]
     pot_accounts = source_accounts["POT_ACCOUNTS"]
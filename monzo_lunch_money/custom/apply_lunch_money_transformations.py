@@ -1,73 +1,17 @@
 import os
 import re
-from json import loads
+from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import orjson
 import pandas as pd
 from monzo_api_wrapper.utils.custom_logger import loggable
 
+from monzo_lunch_money.utils.mapping import map_unique_values
 
-@loggable
-def map_category_id(transactions_df: pd.DataFrame, categories_dict: dict) -> pd.DataFrame:
-    """Map category names to category IDs using the provided dictionary.
-
-    Args:
-        transactions_df (pd.DataFrame): DataFrame containing transaction withs col 'category'.
-        categories_dict (dict): Dictionary mapping category names to category IDs.
-
-    Returns:
-        pd.DataFrame: DataFrame with a new 'category_id' column.
-
-    """
-    transactions_df["category_id"] = transactions_df["category"].map(categories_dict)
-    return transactions_df
-
-
-@loggable
-def map_asset_id(transactions_df: pd.DataFrame, assets_ids_dict: dict) -> pd.DataFrame:
-    """Map source names to asset IDs and ensure IDs are integers.
-
-    Args:
-        transactions_df (pd.DataFrame): DataFrame containing transactions a 'source' column.
-        assets_ids_dict (dict): Dictionary mapping source names to asset IDs.
-
-    Returns:
-        pd.DataFrame: DataFrame with a new 'asset_id' column as integers.
-
-    """
-    transactions_df["asset_id"] = transactions_df["source"].map(assets_ids_dict).astype(int)
-    return transactions_df
-
-
-@loggable
-def format_date_column(transactions_df: pd.DataFrame) -> pd.DataFrame:
-    """Format the 'date' column to 'YYYY-MM-DD' string format.
-
-    Args:
-        transactions_df (pd.DataFrame): DataFrame with a 'date' column in various formats.
-
-    Returns:
-        pd.DataFrame: DataFrame with 'date' column formatted as 'YYYY-MM-DD'.
-
-    """
-    transactions_df["date"] = pd.to_datetime(transactions_df["date"]).dt.strftime("%Y-%m-%d")
-    return transactions_df
-
-
-@loggable
-def assign_payee_column(transactions_df: pd.DataFrame) -> pd.DataFrame:
-    """Assign the 'description' column to a new 'payee' column.
-
-    Args:
-        transactions_df (pd.DataFrame): DataFrame of transactions with a 'description' column.
-
-    Returns:
-        pd.DataFrame: DataFrame with a new 'payee' column.
-
-    """
-    transactions_df["payee"] = transactions_df["description"]
-    return transactions_df
+hashtag_pattern = re.compile(r"(#\w+)")
 
 
 @loggable
@@ -81,7 +25,10 @@ def replace_blank_with_none(transactions_df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: DataFrame with blank strings replaced by None.
 
     """
-    transactions_df.replace(" ", None, inplace=True)
+    for col in transactions_df.select_dtypes(include="object").columns:
+        blank_mask = (transactions_df[col] == " ").to_numpy()
+        if blank_mask.any():
+            transactions_df.loc[blank_mask, col] = None
     return transactions_df
 
 
@@ -96,15 +43,15 @@ def extract_tags(transactions_df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: DataFrame with hashtags extracted and formatted as lists.
 
     """
-
-    def extract_hashtag(tag: str) -> list[str]:
-        if isinstance(tag, str):
-            match = re.search(r"#(\w+)", tag)
-            if match:
-                return ["#" + match.group(1)]
-        return []
-
-    transactions_df["tags"] = transactions_df["tags"].apply(extract_hashtag)
+    search = hashtag_pattern.search
+    transactions_df["tags"] = pd.Series(
+        [
+            [match.group(1)] if isinstance(tags, str) and (match := search(tags)) else []
+            for tags in transactions_df["tags"].tolist()
+        ],
+        index=transactions_df.index,
+        dtype=object,
+    )
     return transactions_df
 
 
@@ -123,20 +70,62 @@ def filter_declined_transactions(new_transactions_df: pd.DataFrame) -> pd.DataFr
 
 
 @loggable
-def dataframe_to_dict(transactions_df: pd.DataFrame) -> Any:
-    """Convert the DataFrame to a dictionary in JSON-like format.
+def build_final_frame(
+    transactions_df: pd.DataFrame, categories_dict: dict, assets_ids_dict: dict
+) -> pd.DataFrame:
+    """Build the Lunch Money columns from the transactions in a single projection.
+
+    Args:
+        transactions_df (pd.DataFrame): DataFrame of transformed Monzo transactions.
+        categories_dict (dict): Dictionary mapping category names to category IDs.
+        assets_ids_dict (dict): Dictionary mapping source names to asset IDs.
+
+    Returns:
+        pd.DataFrame: DataFrame of the Lunch Money columns in the required order.
+
+    """
+    final_df = pd.DataFrame({
+        "date": pd.to_datetime(transactions_df["date"], format="ISO8601", cache=True).dt.strftime(
+            "%Y-%m-%d"
+        ),
+        "payee": transactions_df["description"],
+        "amount": transactions_df["amount"],
+        "notes": transactions_df["notes"],
+        "category_id": map_unique_values(transactions_df["category"], categories_dict),
+        "tags": transactions_df["tags"],
+        "external_id": transactions_df["id"],
+        "asset_id": map_unique_values(transactions_df["source"], assets_ids_dict).astype(int),
+        "currency": transactions_df["currency"],
+    })
+    final_df = replace_blank_with_none(final_df)
+    tagged_df: pd.DataFrame = extract_tags(final_df)
+    return tagged_df
+
+
+@loggable
+def dataframe_to_dict(transactions_df: pd.DataFrame) -> Iterator[dict[str, Any]]:
+    """Convert the DataFrame rows to dictionaries in JSON-like format.
 
     Args:
         transactions_df (pd.DataFrame): DataFrame to convert.
 
     Returns:
-        list[dict[str, Any]]: List of dictionary representations of the DataFrame in JSON-like format.
+        Iterator[dict[str, Any]]: Dictionary representations of the DataFrame rows. The columns
+            are converted to lists up front and each row dictionary is built as the iterator is
+            consumed, so it can only be consumed once.
 
     """
-    return loads(transactions_df.to_json(orient="records"))
+    columns = [
+        series.astype(object).where(series.notna(), None).tolist()
+        if series.hasnans
+        else series.tolist()
+        for _, series in transactions_df.items()
+    ]
+    return (dict(zip(transactions_df.columns, row)) for row in zip(*columns))
 
 
 @loggable
+@lru_cache(maxsize=1)
 def get_lunch_money_assets() -> dict:
     """Get Lunch Money assets.
 
@@ -145,12 +134,12 @@ def get_lunch_money_assets() -> dict:
 
     """
     lunch_money_assets_path = Path(os.getenv("LUNCH_MONEY_ASSETS_PATH", ""))
-    with lunch_money_assets_path.open() as f:
-        asset_ids_map = loads(f.read())
+    asset_ids_map = orjson.loads(lunch_money_assets_path.read_bytes())
     return {asset_id["display_name"]: int(asset_id["id"]) for asset_id in asset_ids_map["assets"]}
 
 
 @loggable
+@lru_cache(maxsize=1)
 def get_lunch_money_categories() -> dict[str, int]:
     """Get Lunch Money categories.
 
@@ -159,6 +148,5 @@ def get_lunch_money_categories() -> dict[str, int]:
 
     """
     lunch_money_categories_path = Path(os.getenv("LUNCH_MONEY_CATEGORIES_PATH", ""))
-    with lunch_money_categories_path.open() as f:
-        categories_map = loads(f.read())
+    categories_map = orjson.loads(lunch_money_categories_path.read_bytes())
     return {category["name"]: category["id"] for category in categories_map["categories"]}
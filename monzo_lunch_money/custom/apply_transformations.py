@@ -1,13 +1,16 @@
 import os
-from json import loads
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import numpy as np
+import orjson
 import pandas as pd
 from monzo_api_wrapper.utils.custom_logger import CustomLogger, loggable
 from ntfy_wrapper import Notifier
 
+from monzo_lunch_money.utils.mapping import map_unique_values
+
 logger = CustomLogger.get_logger()
 
 all_categories = [
@@ -35,9 +38,25 @@ all_categories = [
     "Fees",
     "Shopping",
 ]
+all_categories_index = pd.Index(all_categories)
+transformed_cols = [
+    "id",
+    "date",
+    "description",
+    "timestamp",
+    "amount",
+    "category",
+    "notes",
+    "decline_reason",
+    "tags",
+    "decline",
+    "currency",
+    "source",
+]
 
 
 @loggable
+@lru_cache(maxsize=1)
 def get_pot_acc_names() -> dict[str, str]:
     """Get the Pot account names.
 
@@ -46,39 +65,27 @@ def get_pot_acc_names() -> dict[str, str]:
 
     """
     path = Path("monzo_lunch_money/shared_info/pot_account_ids.json")
-    with path.open() as pot_account_ids:
-        pot_id_names_dct = loads(pot_account_ids.read())
-        return {pot["id"]: pot["name"] for pot in pot_id_names_dct["pots"]}
-
-
-@loggable
-def get_main_transsactions_df(main_transactions_dct: dict) -> pd.DataFrame:
-    """Get main transactions.
-
-    Args:
-        main_transactions_dct (dict): Dictionary of main transactions
-
-    Returns:
-        pd.DataFrame: Datamframe of transformed main transactions
-
-    """
-    main_transactions_dfs_lst = [pd.DataFrame(dct) for dct in main_transactions_dct.values()]
-    return pd.concat(main_transactions_dfs_lst, ignore_index=True)
+    pot_id_names_dct = orjson.loads(path.read_bytes())
+    return {pot["id"]: pot["name"] for pot in pot_id_names_dct["pots"]}
 
 
 @loggable
-def get_pot_transsactions_df(pot_transactions_dct: dict) -> pd.DataFrame:
-    """Get pot transactions.
+def concat_transactions_dfs(*transactions_dcts: dict) -> pd.DataFrame:
+    """Concatenate the per-account transactions dataframes into one dataframe.
 
     Args:
-        pot_transactions_dct (dict): Dictionary of pot transactions
+        *transactions_dcts (dict): Dictionaries of account name to transactions dataframe
 
     Returns:
-        pd.DataFrame: Datamframe of transformed main transactions
+        pd.DataFrame: Dataframe of transactions from all accounts
 
     """
-    pot_transactions_dfs_lst = [pd.DataFrame(dct) for dct in pot_transactions_dct.values()]
-    return pd.concat(pot_transactions_dfs_lst, ignore_index=True)
+    transactions_dfs_lst: list[pd.DataFrame] = [
+        df for dct in transactions_dcts for df in dct.values()
+    ]
+    if not transactions_dfs_lst:
+        return pd.DataFrame()
+    return pd.concat(transactions_dfs_lst, ignore_index=True)
 
 
 @loggable
@@ -92,6 +99,10 @@ def apply_transformations(transactions_df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: Single dataframe resulting from concatenating all input dataframes,
 
     """
+    if transactions_df.empty:
+        logger.debug("No transactions to transform")
+        return pd.DataFrame(columns=transformed_cols)
+
     logger.debug("Normalising dataframe to flatten nested rows")
     transactions_meta_df = merge_normalise_column(transactions_df, "meta")
     transactions_meta_merchant_data_df = merge_normalise_column(transactions_meta_df, "merchant")
@@ -99,42 +110,17 @@ def apply_transformations(transactions_df: pd.DataFrame) -> pd.DataFrame:
     logger.debug("Renaming columns after merging")
     transactions_renamed_cols = rename_merged_cols(transactions_meta_merchant_data_df)
 
-    logger.debug("Applying formatting and filtering to columns")
-    transactions_df_formatted_amounts = format_amounts(transactions_renamed_cols)
-
-    logger.debug("Convert amount and local_amount to appropriate currencies")
-    transactions_df_set_amount_currency = set_amount_currency(transactions_df_formatted_amounts)
-
-    logger.debug("Keeping original currency and amount where applicable")
-    transactions_df_set_amount_value = set_amount_value(transactions_df_set_amount_currency)
-
-    logger.debug("Creating decline column based on decline_reason presence")
-    transactions_df_decline_col = add_decline_column(transactions_df_set_amount_value)
-
-    logger.debug("Droping unnecessary columns and resetting index")
-    transactions_df_cleaned = drop_cols_and_reset_index(transactions_df_decline_col)
-
     logger.debug("Ensure all columns have a populated value or None")
-    transactions_df_populated = ensure_all_cols_populated(transactions_df_cleaned)
-
-    logger.debug("Using merchant_description in place of description where available")
-    transactions_merchant_desc = set_descriptions(transactions_df_populated)
-
-    logger.debug("Renaming suggested_tags to tags and dropping merchant_description")
-    transactions_tags = set_tags(transactions_merchant_desc)
+    transactions_df_populated = ensure_all_cols_populated(transactions_renamed_cols)
 
-    logger.debug("Sorting transactions by date")
-    transactions_sorted = sort_by_date(transactions_tags)
-
-    logger.debug("Mapping pot account IDs to human-readable names")
+    logger.debug("Applying amount, currency, decline and description transformations")
     pot_id_names_dct = get_pot_acc_names()
-    transactions_pot_acc_ids = map_pot_acc_ids(transactions_sorted, pot_id_names_dct)
-
-    logger.debug("Replacing descriptions starting with PB with values from the notes column")
-    transactions_pb_transactions_desc = replace_pb_transactions_desc(transactions_pot_acc_ids)
+    transactions_df_transformed = apply_column_transformations(
+        transactions_df_populated, pot_id_names_dct
+    )
 
     logger.debug("Converting and formatting date columns")
-    transactions_dates_formatted = format_date_columns(transactions_pb_transactions_desc)
+    transactions_dates_formatted = format_date_columns(transactions_df_transformed)
 
     logger.debug("Sorting the transactions by timestamp in descending order")
     transactions_timestamp_sorted = sort_by_timestamp_descending(transactions_dates_formatted)
@@ -153,7 +139,7 @@ def apply_transformations(transactions_df: pd.DataFrame) -> pd.DataFrame:
         transactions_df_categories_format
     )
 
-    logger.debug("Selecting columns")
+    logger.debug("Selecting columns and renaming suggested_tags to tags")
     transactions_df = select_cols(transactions_df_no_unknown_category)
 
     logger.debug(f"Transformed {len(transactions_df)} transactions from all sources")
@@ -165,9 +151,6 @@ def apply_transformations(transactions_df: pd.DataFrame) -> pd.DataFrame:
 def merge_normalise_column(df: pd.DataFrame, column: str) -> Any:
     """Merge the normalised column back into the dataframe.
 
-    Expand nested JSON structures in a specified DataFrame column using json_normalize and
-    merges the result back into the original dataframe using the index.
-
     Args:
         df (pd.DataFrame): The input DataFrame containing the column to normalize.
         column (str): The name of the column containing JSON-like data to normalize.
@@ -176,116 +159,101 @@ def merge_normalise_column(df: pd.DataFrame, column: str) -> Any:
         pd.DataFrame: A new DataFrame with the specified column normalized and flattened.
 
     """
-    normalised_df = pd.json_normalize(df[column])  # type: ignore[arg-type]
-    return df.drop(columns=[column]).merge(normalised_df, left_index=True, right_index=True)
-
-
-@loggable
-def format_categories(
-    transactions_df: pd.DataFrame, category_replacements_dct: dict
-) -> pd.DataFrame:
-    """Format and replace category codes with names.
-
-    Args:
-        transactions_df (pd.DataFrame): Dataframe of transactions
-        category_replacements_dct (dict): Dictionary of formatted names for custom Monzo categories
-
-    Returns:
-        pd.Dataframe: Transactions dataframe with formatted category column.
-
-    """
-    transactions_df["category"] = transactions_df["category"].replace(category_replacements_dct)
-    transactions_df["category"] = transactions_df["category"].str.replace("_", " ").str.title()
 
-    return transactions_df
+    def flatten(dct: dict, prefix: str = "") -> dict:
+        flat = {}
+        for key, value in dct.items():
+            name = f"{prefix}{key}"
+            if isinstance(value, dict):
+                flat.update(flatten(value, f"{name}."))
+            else:
+                flat[name] = value
+        return flat
+
+    values = df[column].tolist()
+    normalised: dict[str, list] = {}
+    for i, value in enumerate(values):
+        if isinstance(value, dict):
+            for key, item in flatten(value).items():
+                normalised_col = normalised.get(key)
+                if normalised_col is None:
+                    normalised_col = normalised[key] = [np.nan] * len(values)
+                normalised_col[i] = item
+
+    remaining_df = df.drop(columns=[column])
+    overlapping = set(remaining_df.columns).intersection(normalised)
+    remaining_df = remaining_df.rename(columns={col: f"{col}_x" for col in overlapping})
+    normalised_df = pd.DataFrame(
+        {f"{key}_y" if key in overlapping else key: col for key, col in normalised.items()},
+        index=df.index,
+    )
+    return pd.concat([remaining_df, normalised_df], axis=1)
 
 
 @loggable
-def format_amounts(transactions_df: pd.DataFrame) -> pd.DataFrame:
-    """Format the amount column to be in pounds and set to positive numbers.
+def apply_column_transformations(
+    transactions_df: pd.DataFrame, pot_id_names_dct: dict
+) -> pd.DataFrame:
+    """Apply the amount, currency, decline and description transformations in one pass.
 
     Args:
-        transactions_df (pd.DataFrame): Dataframe of transactions
+        transactions_df (pd.DataFrame): Dataframe of transactions.
+        pot_id_names_dct (dict): Dictionary of pot id and pot names.
 
     Returns:
-        pd.Dataframe: Dataframe of transactions with formatted amount columns
+        pd.DataFrame: Dataframe of transactions with transformed columns.
 
     """
-    transactions_df["amount"] = -transactions_df["amount"] / 100
-    transactions_df["local_amount"] = -transactions_df["local_amount"] / 100
-
-    return transactions_df
-
+    local_currency = transactions_df["local_currency"]
+    gbp_mask = (local_currency == "GBP").to_numpy()
 
-@loggable
-def set_amount_currency(transactions_df: pd.DataFrame) -> pd.DataFrame:
-    """Set the currency column based on the local currency.
-
-    Args:
-        transactions_df (pd.DataFrame): Dataframe of transactions
+    amount = -transactions_df["amount"].to_numpy() / 100
+    local_amount = -transactions_df["local_amount"].to_numpy() / 100
 
-    Returns:
-        pd.Dataframe: Dataframe of transactions with formatted amount columns
-
-    """
-    transactions_df["currency"] = np.where(
-        transactions_df["local_currency"] != "GBP",
-        transactions_df["local_currency"].str.lower(),
-        transactions_df["currency"].str.lower(),
+    currency = np.where(
+        gbp_mask,
+        transactions_df["currency"].str.lower().to_numpy(),
+        local_currency.str.lower().to_numpy(),
     )
 
-    return transactions_df
+    decline = np.where(transactions_df["decline_reason"].fillna("").to_numpy() == "", 0, 1)
 
-
-@loggable
-def set_amount_value(transactions_df: pd.DataFrame) -> pd.DataFrame:
-    """Set the amount column based on the currency.
-
-    Args:
-        transactions_df (pd.DataFrame): Dataframe of transactions
-
-    Returns:
-        pd.Dataframe: Dataframe of transactions with formatted amount columns
-
-    """
-    transactions_df["amount"] = np.where(
-        transactions_df["local_currency"] == "GBP",
-        transactions_df["amount"],
-        transactions_df["local_amount"],
+    merchant_description = transactions_df["merchant_description"].to_numpy()
+    description = np.where(
+        pd.notna(merchant_description),
+        merchant_description,
+        transactions_df["description"].to_numpy(),
+    )
+    pot_names = map_unique_values(pd.Series(description), pot_id_names_dct).to_numpy()
+    description = np.where(pd.notna(pot_names), pot_names, description)
+    pb_mask = np.char.startswith(description.astype(str), "PB")
+    if pb_mask.any():
+        description[pb_mask] = transactions_df["notes"].to_numpy()[pb_mask]
+
+    return transactions_df.assign(
+        amount=np.where(gbp_mask, amount, local_amount),
+        currency=currency,
+        decline=decline,
+        description=description,
     )
-
-    return transactions_df
-
-
-@loggable
-def add_decline_column(transactions_df: pd.DataFrame) -> pd.DataFrame:
-    """Adds the decline column based on other columns.
-
-    Args:
-        transactions_df (pd.DataFrame): Dataframe of transactions
-
-    Returns:
-        pd.Dataframe: Dataframe of transactions with formatted amount columns
-
-    """
-    transactions_df["decline"] = np.where(transactions_df["decline_reason"].fillna("") == "", 0, 1)
-
-    return transactions_df
 
 
 @loggable
-def drop_cols_and_reset_index(transactions_df: pd.DataFrame) -> pd.DataFrame:
-    """Drops columns no longer required and resets the index.
+def format_categories(
+    transactions_df: pd.DataFrame, category_replacements_dct: dict
+) -> pd.DataFrame:
+    """Format and replace category codes with names.
 
     Args:
         transactions_df (pd.DataFrame): Dataframe of transactions
+        category_replacements_dct (dict): Dictionary of formatted names for custom Monzo categories
 
     Returns:
-        pd.Dataframe: Dataframe of transactions with formatted amount columns
+        pd.Dataframe: Transactions dataframe with formatted category column.
 
     """
-    transactions_df.drop(columns=["local_currency"], inplace=True)
-    transactions_df.reset_index(drop=True, inplace=True)
+    transactions_df["category"] = transactions_df["category"].replace(category_replacements_dct)
+    transactions_df["category"] = transactions_df["category"].str.replace("_", " ").str.title()
 
     return transactions_df
 
@@ -315,110 +283,13 @@ def ensure_all_cols_populated(transactions_df: pd.DataFrame) -> pd.DataFrame:
         "currency",
         "source",
     ]
-    for col in columns:
-        if col not in transactions_df.columns:
-            transactions_df[col] = None
+    missing_columns = [col for col in columns if col not in transactions_df.columns]
+    if missing_columns:
+        transactions_df[missing_columns] = None
 
     return transactions_df
 
 
-@loggable
-def set_descriptions(transactions_df: pd.DataFrame) -> pd.DataFrame:
-    """Sets the description to use the merchant description column where available.
-
-    Drops the merchant column after using it.
-
-    Args:
-        transactions_df (pd.DataFrame): Dataframe of transactions
-
-    Returns:
-        pd.Dataframe: Dataframe of transactions with formatted amount columns
-
-    """
-    transactions_df["description"] = np.where(
-        transactions_df["merchant_description"].notnull(),
-        transactions_df["merchant_description"],
-        transactions_df["description"],
-    )
-    transactions_df.drop(columns=["merchant_description"], inplace=True)
-
-    return transactions_df
-
-
-@loggable
-def set_tags(transactions_df: pd.DataFrame) -> pd.DataFrame:
-    """Sets the tags to use the suggested_tags column.
-
-    Args:
-        transactions_df (pd.DataFrame): Dataframe of transactions
-
-    Returns:
-        pd.Dataframe: Dataframe of transactions with formatted amount columns
-
-    """
-    transactions_df.rename(columns={"suggested_tags": "tags"}, inplace=True)
-
-    return transactions_df
-
-
-@loggable
-def sort_by_date(transactions_df: pd.DataFrame) -> pd.DataFrame:
-    """Sorts the dataframe by the datdataframe by the date.
-
-    Args:
-        transactions_df (pd.DataFrame): Dataframe of transactions
-
-    Returns:
-        pd.Dataframe: Dataframe of transactions with formatted amount columns
-
-    """
-    transactions_df.sort_values("date", inplace=True)
-    return transactions_df
-
-
-@loggable
-def map_pot_acc_ids(transactions_df: pd.DataFrame, pot_id_names_dct: dict) -> pd.DataFrame:
-    """Map the pot account IDS to humand readable names.
-
-    Args:
-        transactions_df (pd.DataFrame): Dataframe of transactions.
-        pot_id_names_dct (dict): Dictionary of pot id and pot names.
-
-    Returns:
-        pd.Dataframe: Dataframe of transactions with formatted amount columns
-
-    """
-    transactions_df["description"] = np.where(
-        ~transactions_df["description"].map(pot_id_names_dct).isna(),
-        transactions_df["description"].map(pot_id_names_dct),
-        transactions_df["description"],
-    )
-
-    return transactions_df
-
-
-@loggable
-def replace_pb_transactions_desc(transactions_df: pd.DataFrame) -> pd.DataFrame:
-    """Replaces the description for transactions beginning with 'PB' with the notes
-    columns.
-
-    Useful for getting Monzo transactions notes for American Express transfers.
-
-    Args:
-        transactions_df (pd.DataFrame): Dataframe of transactions
-
-    Returns:
-        pd.Dataframe: Dataframe of transactions with formatted amount columns
-
-    """
-    transactions_df["description"] = np.where(
-        transactions_df["description"].str.startswith("PB"),
-        transactions_df["notes"],
-        transactions_df["description"],
-    )
-    return transactions_df
-
-
 @loggable
 def format_date_columns(transactions_df: pd.DataFrame) -> pd.DataFrame:
     """Format the date columns.
@@ -430,8 +301,9 @@ def format_date_columns(transactions_df: pd.DataFrame) -> pd.DataFrame:
         pd.Dataframe: Dataframe of transactions with formatted amount columns
 
     """
-    transactions_df["timestamp"] = pd.to_datetime(transactions_df["date"])
-    transactions_df["date"] = pd.to_datetime(transactions_df["date"]).dt.date
+    timestamp = pd.to_datetime(transactions_df["date"], format="ISO8601", cache=True)
+    transactions_df["timestamp"] = timestamp
+    transactions_df["date"] = timestamp.dt.date
 
     return transactions_df
 
@@ -481,7 +353,12 @@ def replace_empty_str_with_none(transactions_df: pd.DataFrame) -> pd.DataFrame:
         pd.Dataframe: Dataframe of transactions with formatted amount columns
 
     """
-    return transactions_df.replace("", None)
+    transactions_df = transactions_df.copy()
+    for col in transactions_df.select_dtypes(include="object").columns:
+        empty_mask = (transactions_df[col] == "").to_numpy()
+        if empty_mask.any():
+            transactions_df.loc[empty_mask, col] = None
+    return transactions_df
 
 
 @loggable
@@ -495,22 +372,20 @@ def select_cols(transactions_df: pd.DataFrame) -> pd.DataFrame:
         pd.Dataframe: Dataframe of transactions with formatted amount columns
 
     """
-    return transactions_df[
-        [
-            "id",
-            "date",
-            "description",
-            "timestamp",
-            "amount",
-            "category",
-            "notes",
-            "decline_reason",
-            "tags",
-            "decline",
-            "currency",
-            "source",
-        ]
-    ]
+    return pd.DataFrame({
+        "id": transactions_df["id"],
+        "date": transactions_df["date"],
+        "description": transactions_df["description"],
+        "timestamp": transactions_df["timestamp"],
+        "amount": transactions_df["amount"],
+        "category": transactions_df["category"],
+        "notes": transactions_df["notes"],
+        "decline_reason": transactions_df["decline_reason"],
+        "tags": transactions_df["suggested_tags"],
+        "decline": transactions_df["decline"],
+        "currency": transactions_df["currency"],
+        "source": transactions_df["source"],
+    })
 
 
 @loggable
@@ -548,32 +423,27 @@ def drop_transactions_unknown_category(transactions_df: pd.DataFrame) -> pd.Data
         pd.DataFrame: Dataframe of transactions with columns renamed.
 
     """
-    if not transactions_df["category"].isin(all_categories).all():
-        unknown_category_transactions = [
-            (
-                transaction["id"],
-                transaction["date"],
-                transaction["category"],
-                transaction["description"],
-                transaction["source"],
-                transaction["decline"],
-            )
-            for _, transaction in transactions_df[
-                ~transactions_df["category"].isin(all_categories)
-            ].iterrows()
-        ]
+    unknown_category_mask = ~transactions_df["category"].isin(all_categories_index)
+    if unknown_category_mask.any():
+        unknown_category_transactions = list(
+            transactions_df.loc[
+                unknown_category_mask,
+                ["id", "date", "category", "description", "source", "decline"],
+            ].itertuples(index=False, name=None)
+        )
 
         ntfy = Notifier()
         ntfy.notify(
             f"{len(unknown_category_transactions)} or more undefined category in transactions: {unknown_category_transactions}"
         )
         logger.warning("There are rows with unknown categories - omitting these transactions")
-        return transactions_df[transactions_df["category"].isin(all_categories)]
+        return transactions_df[~unknown_category_mask]
 
     return transactions_df
 
 
 @loggable
+@lru_cache(maxsize=1)
 def get_categories() -> Any:
     """Get the categories from the config file.
 
@@ -582,5 +452,4 @@ def get_categories() -> Any:
 
     """
     path = Path(os.getenv("MONZO_CATEGORIES_PATH", ""))
-    with path.open("r") as f:
-        return loads(f.read())
+    return orjson.loads(path.read_bytes())
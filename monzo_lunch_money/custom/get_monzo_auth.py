@@ -1,7 +1,7 @@
 import os
-from json import loads
 from pathlib import Path
 
+import orjson
 from monzo.authentication import Authentication
 from monzo.handlers.filesystem import FileSystem
 from monzo_api_wrapper.utils.custom_logger import CustomLogger, loggable
@@ -18,8 +18,7 @@ def get_monzo_auth() -> Authentication:
 
     """
     path = Path(os.getenv("MONZO_TOKENS_PATH", ""))
-    with path.open() as tokens:
-        content = loads(tokens.read())
+    content = orjson.loads(path.read_bytes())
 
     monzo_auth_obj = Authentication(
         client_id=os.getenv("MONZO_CLIENT_ID", ""),
@@ -1,8 +1,12 @@
-import json
 import os
+from collections.abc import Callable, Iterable
 
+import orjson
 import requests
 from monzo_api_wrapper.utils.custom_logger import CustomLogger, loggable
+from requests.adapters import HTTPAdapter
+
+from monzo_lunch_money.utils.concurrency import map_bounded
 
 logger = CustomLogger.get_logger()
 
@@ -14,12 +18,13 @@ class UpdateChangedTransactionsError(Exception):
 
 
 @loggable
-def send_payload(url: str, headers: dict, payload: dict) -> None:
+def send_payload(session: requests.Session, url: str, payload: dict) -> None:
     """Send the payload over the Lunch Money API.
 
     Args:
+        session (requests.Session): Session holding the authentication headers and pooled
+            connections
         url (str): URL for Lunch Money transactions
-        headers (dict): Headers for authentication
         payload (dict): Data to send in the payload
 
     Raises:
@@ -27,7 +32,7 @@ def send_payload(url: str, headers: dict, payload: dict) -> None:
 
     """
     try:
-        response = requests.put(url, headers=headers, data=json.dumps(payload), timeout=10)
+        response = session.put(url, data=orjson.dumps(payload), timeout=10)
         response.raise_for_status()
         logger.info(f"{response.text}")
     except requests.RequestException as e:
@@ -36,36 +41,68 @@ def send_payload(url: str, headers: dict, payload: dict) -> None:
 
 
 @loggable
-def update_changed_lunch_money_transactions(transactions_dct_lst: list | dict) -> None:
+def send_transaction(
+    session: requests.Session, transaction_url: Callable[..., str], transaction: dict, id_key: str
+) -> None:
+    """Send a single changed transaction to the Lunch Money API.
+
+    Args:
+        session (requests.Session): Session holding the authentication headers and pooled
+            connections
+        transaction_url (Callable[..., str]): Formatter building the URL of a Lunch Money
+            transaction from its ID
+        transaction (dict): Changed transaction to update
+        id_key (str): Key of the transaction holding its Lunch Money ID
+
+    """
+    url = transaction_url(transaction[id_key])
+    payload = {"transaction": transaction}
+    send_payload(session=session, url=url, payload=payload)
+
+
+@loggable
+def update_changed_lunch_money_transactions(
+    transactions_dct_lst: Iterable[dict] | dict, max_workers: int = 8
+) -> None:
     """Updates changed transactions to the Lunch Money API.
 
-    This function takes a list or dictionary of transaction data and uploads it to the Lunch Money API.
-    If the input is a list, it updates sequentially. If the input is a dictionary,
-    it wraps it in a list and sends it as a single transaction.
+    This function takes an iterable or dictionary of transaction data and uploads it to the Lunch
+    Money API. If the input is an iterable, the updates are sent concurrently from a pool of
+    threads. If the input is a dictionary, it wraps it in a list and sends it as a single
+    transaction.
 
     Args:
-        transactions_dct_lst (Union[dict, list]): A dictionary or list of transaction data to upload.
-        chunk_size (int, optional): The number of transactions to upload per request when input is a list.
-            Defaults to 1.
+        transactions_dct_lst (Union[dict, Iterable[dict]]): A dictionary or iterable of transaction
+            data to upload.
+        max_workers (int, optional): The number of updates to send concurrently when input is an
+            iterable. Defaults to 8.
 
     """
-    base_url = os.getenv("LUNCH_MONEY_BASE_API_URL", "")
+    transaction_url = (os.getenv("LUNCH_MONEY_BASE_API_URL", "") + "transactions/{}").format
     headers = {
         "Authorization": f"Bearer {os.getenv('LUNCH_MONEY_ACCESS_TOKEN', '')}",
         "Content-Type": "application/json",
     }
 
-    if isinstance(transactions_dct_lst, list):
-        chunk_size = 1
-        for start in range(0, len(transactions_dct_lst), chunk_size):
-            chunk = transactions_dct_lst[start : start + chunk_size]
-            logger.debug(f"chunk {chunk[0]}")
-            lunch_money_id = chunk[0]["lunch_money_id"]
-            url = base_url + f"transactions/{lunch_money_id}"
-            payload = {"transaction": chunk[0]}
-            send_payload(url=url, headers=headers, payload=payload)
-    else:
-        lunch_money_id = transactions_dct_lst["transaction_id"]
-        url = base_url + f"transactions/{lunch_money_id}"
-        payload = {"transaction": transactions_dct_lst}
-        send_payload(url=url, headers=headers, payload=payload)
+    with requests.Session() as session:
+        session.headers.update(headers)
+        session.mount("https://", HTTPAdapter(pool_maxsize=16))
+
+        if isinstance(transactions_dct_lst, dict):
+            send_transaction(
+                session=session,
+                transaction_url=transaction_url,
+                transaction=transactions_dct_lst,
+                id_key="transaction_id",
+            )
+        else:
+            map_bounded(
+                lambda transaction: send_transaction(
+                    session=session,
+                    transaction_url=transaction_url,
+                    transaction=transaction,
+                    id_key="lunch_money_id",
+                ),
+                transactions_dct_lst,
+                max_workers=max_workers,
+            )
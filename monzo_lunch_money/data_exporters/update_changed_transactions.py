@@ -2,12 +2,15 @@ import os
 from typing import Any
 
 import pandas as pd
-from monzo_api_wrapper.utils import sql_templates
 from monzo_api_wrapper.utils.custom_logger import CustomLogger, loggable
 from monzo_api_wrapper.utils.db import Db
 
+from monzo_lunch_money.utils import sql_templates as lunch_money_sql_templates
+
 logger = CustomLogger.get_logger()
 
+lookup_batch_size = 1000
+
 
 @loggable
 def update_changed_transactions(db: Db, changed_transactions_df: pd.DataFrame) -> None:
@@ -23,8 +26,8 @@ def update_changed_transactions(db: Db, changed_transactions_df: pd.DataFrame) -
     """
     changed_transactions_df = add_lunch_money_ids(db, changed_transactions_df)
     try:
-        transactions_to_delete_ids_str = (
-            str(changed_transactions_df["id"].to_list()).strip("[").strip("]")
+        transactions_to_delete_ids_str = ", ".join(
+            f"'{transaction_id}'" for transaction_id in changed_transactions_df["id"]
         )
         logger.info(transactions_to_delete_ids_str)
         db.delete(table=os.getenv("DB_TABLE", ""), data=transactions_to_delete_ids_str)
@@ -35,30 +38,37 @@ def update_changed_transactions(db: Db, changed_transactions_df: pd.DataFrame) -
 
 
 @loggable
-def get_lunch_money_id(db: Db, monzo_transaction_id: str) -> Any:
-    """Get the Lunch Money id from the database.
+def fetch_lunch_money_ids(db: Db, monzo_transaction_ids: list[str]) -> dict[str, Any]:
+    """Get the Lunch Money ids for a list of Monzo transactions in bulk.
 
     Args:
         db (Db): Database connection object.
-        monzo_transaction_id (str): Monzo transaction ID.
+        monzo_transaction_ids (list[str]): Monzo transaction IDs.
 
     Returns:
-        str: Series containing Lunch Money IDs
+        dict[str, Any]: Dictionary of Monzo transaction ID to Lunch Money ID.
 
     """
-    lunch_money_id = db.query(
-        sql=sql_templates.get_id.format(
-            table=os.getenv("DB_TABLE"), external_id=monzo_transaction_id
+    table = os.getenv("DB_TABLE")
+    lunch_money_ids: dict[str, Any] = {}
+    for start in range(0, len(monzo_transaction_ids), lookup_batch_size):
+        external_ids = ", ".join(
+            f"'{transaction_id}'"
+            for transaction_id in monzo_transaction_ids[start : start + lookup_batch_size]
+        )
+        lunch_money_ids_df = db.query(
+            sql=lunch_money_sql_templates.get_ids.format(table=table, external_ids=external_ids)
         )
-    )
-    if lunch_money_id is not None:
-        return lunch_money_id["lunch_money_id"]
-    return None
+        if lunch_money_ids_df is not None:
+            lunch_money_ids.update(
+                zip(lunch_money_ids_df["id"], lunch_money_ids_df["lunch_money_id"])
+            )
+    return lunch_money_ids
 
 
 @loggable
 def add_lunch_money_ids(db: Db, changed_transactions: pd.DataFrame) -> pd.DataFrame:
-    """Apply function to get Lunch Money IDs.
+    """Add the Lunch Money IDs, looked up for all transactions at once.
 
     Args:
         db (Db): Database connection object
@@ -68,7 +78,6 @@ def add_lunch_money_ids(db: Db, changed_transactions: pd.DataFrame) -> pd.DataFr
         pd.DataFrame: Dataframe of changed transactions with lunch_money_id field populated.
 
     """
-    changed_transactions["lunch_money_id"] = changed_transactions["id"].apply(
-        lambda x: get_lunch_money_id(db, x)
-    )
+    lunch_money_ids = fetch_lunch_money_ids(db, changed_transactions["id"].tolist())
+    changed_transactions["lunch_money_id"] = changed_transactions["id"].map(lunch_money_ids)
     return changed_transactions
@@ -1,12 +1,16 @@
-import json
 import os
+from collections.abc import Iterable
+from itertools import islice
 from typing import Optional
 
+import orjson
 import requests
-from monzo_api_wrapper.utils import sql_templates
 from monzo_api_wrapper.utils.custom_logger import CustomLogger, loggable
 from monzo_api_wrapper.utils.db import Db
 
+from monzo_lunch_money.utils import sql_templates as lunch_money_sql_templates
+from monzo_lunch_money.utils.concurrency import map_bounded
+
 logger = CustomLogger.get_logger()
 
 
@@ -27,20 +31,23 @@ class APIError(Exception):
 
 @loggable
 def upload_new_lunch_money_transactions(
-    db: Db, transactions_dct_lst: list | dict, chunk_size: int = 1
+    db: Db, transactions_dct_lst: Iterable[dict] | dict, chunk_size: int = 50, max_workers: int = 8
 ) -> None:
     """Uploads new transactions to the Lunch Money API.
 
-    This function takes a list or dictionary of transaction data and uploads it to the Lunch Money API.
-    If the input is a list, it uploads in chunks for efficient processing. If the input is a dictionary,
-    it wraps it in a list and sends it as a single transaction. It also updates the local database with
-    the Lunch Money transaction IDs after a successful upload.
+    This function takes an iterable or dictionary of transaction data and uploads it to the Lunch
+    Money API. If the input is an iterable, it uploads in chunks, sent concurrently from a pool of
+    threads. If the input is a dictionary, it wraps it in a list and sends it as a single transaction. It also
+    updates the local database with the Lunch Money transaction IDs after a successful upload.
 
     Args:
         db (Db): Database connection object.
-        transactions_dct_lst (Union[dict, list]): A dictionary or list of transaction data to upload.
-        chunk_size (int, optional): The number of transactions to upload per request when input is a list.
-            Defaults to 1.
+        transactions_dct_lst (Union[dict, Iterable[dict]]): A dictionary or iterable of transaction
+            data to upload.
+        chunk_size (int, optional): The number of transactions to upload per request when input is
+            an iterable. Defaults to 50.
+        max_workers (int, optional): The number of chunks to upload concurrently when input is an
+            iterable. Defaults to 8.
 
     Raises:
         Exception: When environment variables for URL and tokens are missing.
@@ -55,39 +62,81 @@ def upload_new_lunch_money_transactions(
         )
         raise Exception("Environment variables for API access are missing.")
 
-    if isinstance(transactions_dct_lst, list):
-        for start in range(0, len(transactions_dct_lst), chunk_size):
-            chunk = transactions_dct_lst[start : start + chunk_size]
-            process_transaction_chunk(db=db, chunk=chunk)
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": "application/json",
+    }
+
+    if isinstance(transactions_dct_lst, dict):
+        process_transaction_chunk(
+            db=db, chunk=[transactions_dct_lst], api_url=api_url, headers=headers
+        )
     else:
-        process_transaction_chunk(db=db, chunk=[transactions_dct_lst])
+        process_transaction_chunks(
+            db=db,
+            transactions_dct_lst=transactions_dct_lst,
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+            api_url=api_url,
+            headers=headers,
+        )
+
+
+@loggable
+def process_transaction_chunks(
+    db: Db,
+    transactions_dct_lst: Iterable[dict],
+    chunk_size: int,
+    max_workers: int,
+    api_url: str,
+    headers: dict,
+) -> None:
+    """Split transactions into chunks and upload them concurrently to Lunch Money.
+
+    Args:
+        db (Db): Database connection object.
+        transactions_dct_lst (Iterable[dict]): Transactions to be uploaded.
+        chunk_size (int): The number of transactions to upload per request.
+        max_workers (int): The number of chunks to upload concurrently.
+        api_url (str): URL for Lunch Money transactions.
+        headers (dict): Headers for authentication.
+
+    """
+    transactions = iter(transactions_dct_lst)
+    chunks = iter(lambda: list(islice(transactions, chunk_size)), [])
+    map_bounded(
+        lambda chunk: process_transaction_chunk(
+            db=db, chunk=chunk, api_url=api_url, headers=headers
+        ),
+        chunks,
+        max_workers=max_workers,
+    )
 
 
 @loggable
-def process_transaction_chunk(db: Db, chunk: list[dict]) -> None:
+def process_transaction_chunk(db: Db, chunk: list[dict], api_url: str, headers: dict) -> None:
     """Processes and uploads a single chunk of transactions to the Lunch Money API.
 
     This helper function sends a chunk of transactions as a POST request to the Lunch Money API.
-    It also updates the local database with the returned Lunch Money ID for each transaction.
+    It also updates the local database with the returned Lunch Money ID for each transaction, the
+    returned IDs being in the same order as the transactions in the chunk. If the number of IDs
+    does not match the chunk, no IDs are saved and the chunk's external IDs are logged.
 
     Args:
         db (Db): Database connection object.
         chunk (List[dict]): A chunk of transactions to be uploaded.
+        api_url (str): URL for Lunch Money transactions.
+        headers (dict): Headers for authentication.
 
     Raises:
         APIError exception is raised if response is an error.
 
     """
-    headers = {
-        "Authorization": f"Bearer {os.getenv('LUNCH_MONEY_ACCESS_TOKEN')}",
-        "Content-Type": "application/json",
-    }
-
     try:
         response = requests.post(
-            os.getenv("LUNCH_MONEY_BASE_API_URL", "") + "transactions",
+            api_url,
             headers=headers,
-            data=json.dumps({"transactions": chunk, "apply_rules": True}),
+            data=orjson.dumps({"transactions": chunk, "apply_rules": True}),
             timeout=10,
         )
         response.raise_for_status()  # Raises HTTPError for non-2xx responses
@@ -99,11 +148,18 @@ def process_transaction_chunk(db: Db, chunk: list[dict]) -> None:
             raise APIError("API responded with an error", response_data=response_data)
 
         # Process successful response
-        if "ids" in response_data:
-            lunch_money_id = response_data["ids"][0]
-            lunch_money_id_monzo_id_map = {chunk[0]["external_id"]: lunch_money_id}
+        if "ids" in response_data and len(response_data["ids"]) != len(chunk):
+            external_ids = [transaction["external_id"] for transaction in chunk]
+            logger.error(
+                f"Received {len(response_data['ids'])} IDs for {len(chunk)} transactions, "
+                f"Lunch Money IDs not saved for: {external_ids}"
+            )
+        elif "ids" in response_data:
+            lunch_money_id_monzo_id_map = dict(
+                zip((transaction["external_id"] for transaction in chunk), response_data["ids"])
+            )
             update_db_transactions_id(db, lunch_money_id_monzo_id_map)
-            logger.debug(f"Updated database with new Lunch Money ID for chunk: {chunk}")
+            logger.debug(f"Updated database with new Lunch Money IDs for chunk: {chunk}")
         else:
             logger.warning(f"Unexpected response structure: {response_data}")
     except APIError as e:
@@ -116,20 +172,24 @@ def process_transaction_chunk(db: Db, chunk: list[dict]) -> None:
 def update_db_transactions_id(db: Db, transactions_id_map: dict[str, int]) -> None:
     """Update the database with Lunch Money transaction IDs.
 
-    For each transaction, this function updates the `lunch_money_id` in the database for the given
-    `external_id`.
+    All transactions are updated in a single statement, setting the `lunch_money_id` for each
+    `external_id` through a CASE expression.
 
     Args:
         db (Db): Database connection object.
         transactions_id_map (Dict[str, int]): A mapping of `external_id` to `lunch_money_id`.
 
     """
-    for external_id, lunch_money_id in transactions_id_map.items():
-        db.query(
-            sql=sql_templates.add_id.format(
-                table=os.getenv("DB_TABLE"),
-                lunch_money_id=lunch_money_id,
-                external_id=external_id,
-            ),
-            return_data=False,
-        )
+    if not transactions_id_map:
+        return
+    cases = " ".join(
+        f"WHEN '{external_id}' THEN {lunch_money_id}"
+        for external_id, lunch_money_id in transactions_id_map.items()
+    )
+    external_ids = ", ".join(f"'{external_id}'" for external_id in transactions_id_map)
+    db.query(
+        sql=lunch_money_sql_templates.add_ids.format(
+            table=os.getenv("DB_TABLE"), cases=cases, external_ids=external_ids
+        ),
+        return_data=False,
+    )
@@ -1,4 +1,5 @@
 import asyncio
+import os
 
 import pandas as pd
 from monzo.authentication import Authentication
@@ -21,15 +22,17 @@ async def get_main_transactions(
         dict of main accounts transactions
 
     """
+    semaphore = asyncio.Semaphore(int(os.getenv("MONZO_CONCURRENCY", "4")))
 
     async def fetch_transactions(acc_name: str, acc_id: str) -> tuple[str, pd.DataFrame]:
-        df = await asyncio.to_thread(
-            get_transactions_df,
-            days_lookback=days_lookback,
-            monzo_auth=monzo_auth_obj,
-            account_id=acc_id,
-            account_name=acc_name,
-        )
+        async with semaphore:
+            df = await asyncio.to_thread(
+                get_transactions_df,
+                days_lookback=days_lookback,
+                monzo_auth=monzo_auth_obj,
+                account_id=acc_id,
+                account_name=acc_name,
+            )
         return acc_name, df
 
     tasks = [fetch_transactions(acc_name, acc_id) for acc_name, acc_id in main_accounts.items()]
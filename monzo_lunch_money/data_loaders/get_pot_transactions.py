@@ -1,4 +1,5 @@
 import asyncio
+import os
 
 import pandas as pd
 from monzo.authentication import Authentication
@@ -21,15 +22,17 @@ async def get_pot_transactions(
         dict of Pot transactions
 
     """
+    semaphore = asyncio.Semaphore(int(os.getenv("MONZO_CONCURRENCY", "4")))
 
     async def fetch_transactions(acc_id: str, acc_name: str) -> tuple[str, pd.DataFrame]:
-        df = await asyncio.to_thread(
-            get_transactions_df,
-            days_lookback=days_lookback,
-            monzo_auth=monzo_auth_obj,
-            account_id=acc_id,
-            account_name=f"{acc_name} Pot",
-        )
+        async with semaphore:
+            df = await asyncio.to_thread(
+                get_transactions_df,
+                days_lookback=days_lookback,
+                monzo_auth=monzo_auth_obj,
+                account_id=acc_id,
+                account_name=f"{acc_name} Pot",
+            )
         return acc_name, df
 
     tasks = [fetch_transactions(acc_id, acc_name) for acc_id, acc_name in pot_accounts.values()]
@@ -0,0 +1,25 @@
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def map_bounded(func: Callable[[T], Any], items: Iterable[T], max_workers: int) -> None:
+    """Apply a function to each item from a thread pool, keeping at most max_workers in flight.
+
+    Args:
+        func (Callable[[T], Any]): Function to apply to each item.
+        items (Iterable[T]): Items to process, pulled only as workers become free.
+        max_workers (int): The number of items to process concurrently.
+
+    """
+    in_flight: deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for item in items:
+            if len(in_flight) >= max_workers:
+                in_flight.popleft().result()
+            in_flight.append(executor.submit(func, item))
+        while in_flight:
+            in_flight.popleft().result()
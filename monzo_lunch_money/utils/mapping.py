@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+from monzo_api_wrapper.utils.custom_logger import loggable
+from pandas.api.extensions import take
+
+large_mapping_size = 10_000
+
+
+@loggable
+def map_unique_values(series: pd.Series, mapping: dict) -> pd.Series:
+    """Map the values of a series through a dictionary, looking up each unique value once.
+
+    Args:
+        series (pd.Series): Series of values to map.
+        mapping (dict): Dictionary mapping values to their replacements.
+
+    Returns:
+        pd.Series: Series of mapped values, NaN where a value has no mapping.
+
+    """
+    codes, uniques = pd.factorize(series)
+    if len(mapping) > large_mapping_size:
+        mapped = pd.Series([mapping.get(value, np.nan) for value in uniques]).to_numpy()
+    else:
+        mapped = pd.Series(uniques).map(mapping).to_numpy()
+    return pd.Series(take(mapped, codes, allow_fill=True), index=series.index, name=series.name)
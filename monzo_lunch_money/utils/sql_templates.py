@@ -0,0 +1,11 @@
+get_ids = """
+SELECT id, lunch_money_id
+FROM {table} x
+WHERE x.id IN ({external_ids})
+"""
+
+add_ids = """
+UPDATE {table}
+SET lunch_money_id = CASE id {cases} END
+WHERE id IN ({external_ids})
+"""
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from monzo_lunch_money.custom.apply_transformations import merge_normalise_column
+
+
+def json_normalize_merge(df: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Normalise the column with json_normalize and merge it back on the index."""
+    normalised_df = pd.json_normalize(df[column])
+    return df.drop(columns=[column]).merge(normalised_df, left_index=True, right_index=True)
+
+
+@pytest.fixture
+def transactions_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        "id": ["tx_1", "tx_2", "tx_3", "tx_4", "tx_5"],
+        "category": ["groceries", "transfers", "eating_out", "shopping", "bills"],
+        "amount": [-120, 5000, -450, -2999, -1500],
+        "meta": [
+            {"notes": "weekly shop", "suggested_tags": "#food"},
+            {"notes": "", "suggested_tags": ""},
+            {"notes": " "},
+            {},
+            {"notes": "gas", "suggested_tags": "#home"},
+        ],
+        "merchant": [
+            {
+                "id": "merch_1",
+                "name": "Tesco",
+                "category": "groceries",
+                "address": {"city": "London", "postcode": "E1 6AN"},
+            },
+            None,
+            "merch_3",
+            {"id": "merch_4", "name": None, "category": "shopping"},
+            {"id": "merch_5", "name": "Octopus", "address": {"city": "Leeds"}},
+        ],
+    })
+
+
+@pytest.mark.parametrize("column", ["meta", "merchant"])
+def test_merge_normalise_column_matches_json_normalize(
+    transactions_df: pd.DataFrame, column: str
+) -> None:
+    result = merge_normalise_column(transactions_df, column)
+    expected = json_normalize_merge(transactions_df, column)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_merge_normalise_column_matches_json_normalize_on_many_rows(
+    transactions_df: pd.DataFrame,
+) -> None:
+    many_transactions_df = pd.concat([transactions_df] * 4000, ignore_index=True)
+    result = merge_normalise_column(many_transactions_df, "merchant")
+    expected = json_normalize_merge(many_transactions_df, "merchant")
+    pd.testing.assert_frame_equal(result, expected)
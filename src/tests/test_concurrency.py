@@ -0,0 +1,36 @@
+import threading
+import time
+from collections.abc import Iterator
+
+from monzo_lunch_money.utils.concurrency import map_bounded
+
+
+def test_map_bounded_limits_items_in_flight() -> None:
+    lock = threading.Lock()
+    pulled = 0
+    in_flight = 0
+    max_in_flight = 0
+    processed: list[int] = []
+
+    def items() -> Iterator[int]:
+        nonlocal pulled
+        for item in range(20):
+            with lock:
+                pulled += 1
+                assert pulled - len(processed) <= 3
+            yield item
+
+    def process(item: int) -> None:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+            processed.append(item)
+
+    map_bounded(process, items(), max_workers=2)
+
+    assert sorted(processed) == list(range(20))
+    assert max_in_flight <= 2
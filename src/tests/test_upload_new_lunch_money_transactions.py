@@ -0,0 +1,72 @@
+from unittest import mock
+
+import orjson
+import pytest
+from monzo_api_wrapper.utils.db import Db
+
+from monzo_lunch_money.data_exporters import upload_new_lunch_money_transactions as uploader
+
+
+def post_response(ids: list[int]) -> mock.Mock:
+    """Build a successful Lunch Money response returning the given IDs."""
+    response = mock.Mock()
+    response.json.return_value = {"ids": ids}
+    return response
+
+
+@pytest.fixture
+def db() -> mock.Mock:
+    db: mock.Mock = mock.create_autospec(Db, instance=True)
+    return db
+
+
+@pytest.fixture(autouse=True)
+def lunch_money_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LUNCH_MONEY_ACCESS_TOKEN", "token")
+    monkeypatch.setenv("LUNCH_MONEY_BASE_API_URL", "https://lunch.money/v1/")
+    monkeypatch.setenv("DB_TABLE", "transactions")
+
+
+def test_upload_saves_ids_for_each_chunk(db: mock.Mock) -> None:
+    def post(url: str, headers: dict, data: bytes, timeout: int) -> mock.Mock:
+        transactions = orjson.loads(data)["transactions"]
+        return post_response([
+            100 + int(transaction["external_id"].removeprefix("tx_"))
+            for transaction in transactions
+        ])
+
+    transactions = ({"external_id": f"tx_{i}"} for i in range(5))
+    with mock.patch.object(uploader.requests, "post", side_effect=post) as requests_post:
+        uploader.upload_new_lunch_money_transactions(db, transactions, chunk_size=2, max_workers=2)
+
+    assert requests_post.call_count == 3
+    assert requests_post.call_args.args == ("https://lunch.money/v1/transactions",)
+    sqls = {call.kwargs["sql"] for call in db.query.call_args_list}
+    assert sqls == {
+        uploader.lunch_money_sql_templates.add_ids.format(
+            table="transactions",
+            cases="WHEN 'tx_0' THEN 100 WHEN 'tx_1' THEN 101",
+            external_ids="'tx_0', 'tx_1'",
+        ),
+        uploader.lunch_money_sql_templates.add_ids.format(
+            table="transactions",
+            cases="WHEN 'tx_2' THEN 102 WHEN 'tx_3' THEN 103",
+            external_ids="'tx_2', 'tx_3'",
+        ),
+        uploader.lunch_money_sql_templates.add_ids.format(
+            table="transactions", cases="WHEN 'tx_4' THEN 104", external_ids="'tx_4'"
+        ),
+    }
+
+
+def test_id_count_mismatch_skips_chunk_without_resending(db: mock.Mock) -> None:
+    chunk = [{"external_id": f"tx_{i}"} for i in range(3)]
+    with mock.patch.object(
+        uploader.requests, "post", return_value=post_response([100, 101])
+    ) as requests_post:
+        uploader.process_transaction_chunk(
+            db=db, chunk=chunk, api_url="https://lunch.money/v1/transactions", headers={}
+        )
+
+    requests_post.assert_called_once()
+    db.query.assert_not_called()